@@ -12,12 +12,13 @@ Example::
  True
  >>> y = dump(x)
  >>> y.encode("hex")
- '140e0b686557080c6c6c6f580216033930300003061840323333333333331b402a000000000000403233333333333319125152531a1255565705'
+ '140e0b686557080c6c6c6f58020700000000000003840003061840323333333333331b402a000000000000403233333333333319125152531a1255565705'
  >>> z = load(y)
  >>> x == z
  True
 """
-from rpyc.lib.compat import Struct, BytesIO, is_py3k, BYTES_LITERAL
+from rpyc.lib.compat import Struct, is_py3k, BYTES_LITERAL, execute
+import struct
 
 
 # singletons
@@ -28,6 +29,7 @@ TAG_TRUE = b"\x03"
 TAG_FALSE = b"\x04"
 TAG_NOT_IMPLEMENTED = b"\x05"
 TAG_ELLIPSIS = b"\x06"
+TAG_INT64 = b"\x07"
 # types
 TAG_UNICODE = b"\x08"
 TAG_LONG = b"\x09"
@@ -49,19 +51,46 @@ TAG_FLOAT = b"\x18"
 TAG_SLICE = b"\x19"
 TAG_FSET = b"\x1a"
 TAG_COMPLEX = b"\x1b"
+TAG_TUP_IMM_L1 = b"\x1c"
+TAG_REF = b"\x1d"
+TAG_TUP_INT64 = b"\x1e"
+TAG_TUP_IMM_L4 = b"\x1f"
 if is_py3k:
     IMM_INTS = dict((i, bytes([i + 0x50])) for i in range(-0x30, 0xa0))
 else:
     IMM_INTS = dict((i, chr(i + 0x50)) for i in range(-0x30, 0xa0))
+# the same, indexed by ``value + 0x30``, so dumping takes a range check and
+# a list index rather than two dict lookups
+IMM_INTS_LIST = [IMM_INTS[i] for i in range(-0x30, 0xa0)]
 
 I1 = Struct("!B")
 I4 = Struct("!L")
+I8 = Struct("!q")
 F8 = Struct("!d")
 C16 = Struct("!dd")
+# tag-prefixed variants, so a header is packed by a single call
+TI4 = Struct("!cL")
+TI8 = Struct("!cq")
+TF8 = Struct("!cd")
+TC16 = Struct("!cdd")
+# precomputed headers of the one-byte-length tags, indexed by length
+_INT_L1_HEADERS = tuple(TAG_INT_L1 + I1.pack(i) for i in range(256))
+_STR_L1_HEADERS = tuple(TAG_STR_L1 + I1.pack(i) for i in range(256))
+_TUP_L1_HEADERS = tuple(TAG_TUP_L1 + I1.pack(i) for i in range(256))
+# headers of bytes of any length below 256, and the reverse for the short ones
+_STR_HEADERS = (TAG_EMPTY_STR, TAG_STR1, TAG_STR2, TAG_STR3, TAG_STR4) + _STR_L1_HEADERS[5:]
+_STR_LENGTHS = dict((ord(tag), i) for i, tag in enumerate(_STR_HEADERS[:5]))
+_STR_L1_ORD = ord(TAG_STR_L1)
+_TUP_IMM_L1_HEADERS = tuple(TAG_TUP_IMM_L1 + I1.pack(i) for i in range(256))
 
 _dump_registry = {}
 _load_registry = {}
-IMM_INTS_LOADER = dict((v, k) for k, v in IMM_INTS.items())
+# loaders indexed by the ordinal of their tag, filled once all loaders are registered
+LOAD_TABLE = [None] * 256
+# the utf8 encoding of short strings, which are mostly attribute and method names
+_encode_cache = {}
+ENCODE_CACHE_SIZE = 1024
+ENCODE_CACHE_MAX_LEN = 64
 
 
 def register(coll, key):
@@ -73,6 +102,30 @@ def register(coll, key):
 # ===============================================================================
 # dumping
 # ===============================================================================
+class _Writer(list):
+    """The chunks of a dump, along with its memo: strings and bytes longer than 4
+    are numbered in the order they are dumped, and repeated occurrences are
+    written as a back-reference to that number. The memo holds on to the
+    objects, so their ids can't be reused by temporaries.
+
+    Only such leaves are memoized: a reference to a container would let a few
+    bytes on the wire stand for an exponentially large structure"""
+    __slots__ = ("memo",)
+
+    def __init__(self):
+        list.__init__(self)
+        self.memo = {}
+
+
+def _encode_ref(index):
+    ref = bytearray(TAG_REF)
+    while index >= 0x80:
+        ref.append(index & 0x7f | 0x80)
+        index >>= 7
+    ref.append(index)
+    return bytes(ref)
+
+
 @register(_dump_registry, type(None))
 def _dump_none(obj, stream):
     stream.append(TAG_NONE)
@@ -110,25 +163,29 @@ def _dump_frozenset(obj, stream):
 
 @register(_dump_registry, int)
 def _dump_int(obj, stream):
-    if obj in IMM_INTS:
-        stream.append(IMM_INTS[obj])
+    if -0x30 <= obj < 0xa0:
+        stream.append(IMM_INTS_LIST[obj + 0x30])
+    elif -0x8000000000000000 <= obj < 0x8000000000000000:
+        # machine-sized ints are sent in binary, sparing the str()/int() round trip
+        stream.append(TI8.pack(TAG_INT64, obj))
     else:
         obj = BYTES_LITERAL(str(obj))
         lenobj = len(obj)
         if lenobj < 256:
-            stream.append(TAG_INT_L1 + I1.pack(lenobj) + obj)
+            stream.append(_INT_L1_HEADERS[lenobj])
         else:
-            stream.append(TAG_INT_L4 + I4.pack(lenobj) + obj)
+            stream.append(TI4.pack(TAG_INT_L4, lenobj))
+        stream.append(obj)
 
 
 @register(_dump_registry, float)
 def _dump_float(obj, stream):
-    stream.append(TAG_FLOAT + F8.pack(obj))
+    stream.append(TF8.pack(TAG_FLOAT, obj))
 
 
 @register(_dump_registry, complex)
 def _dump_complex(obj, stream):
-    stream.append(TAG_COMPLEX + C16.pack(obj.real, obj.imag))
+    stream.append(TC16.pack(TAG_COMPLEX, obj.real, obj.imag))
 
 
 @register(_dump_registry, bytes)
@@ -137,23 +194,51 @@ def _dump_bytes(obj, stream):
     if lenobj == 0:
         stream.append(TAG_EMPTY_STR)
     elif lenobj == 1:
-        stream.append(TAG_STR1 + obj)
+        stream.append(TAG_STR1)
     elif lenobj == 2:
-        stream.append(TAG_STR2 + obj)
+        stream.append(TAG_STR2)
     elif lenobj == 3:
-        stream.append(TAG_STR3 + obj)
+        stream.append(TAG_STR3)
     elif lenobj == 4:
-        stream.append(TAG_STR4 + obj)
-    elif lenobj < 256:
-        stream.append(TAG_STR_L1 + I1.pack(lenobj) + obj)
+        stream.append(TAG_STR4)
     else:
-        stream.append(TAG_STR_L4 + I4.pack(lenobj) + obj)
+        memo = stream.memo
+        key = id(obj)
+        if key in memo:
+            stream.append(_encode_ref(memo[key][0]))
+            return
+        memo[key] = (len(memo), obj)
+        if lenobj < 256:
+            stream.append(_STR_L1_HEADERS[lenobj])
+        else:
+            stream.append(TI4.pack(TAG_STR_L4, lenobj))
+    stream.append(obj)
 
 
 @register(_dump_registry, type(u""))
 def _dump_str(obj, stream):
+    memo = stream.memo
+    key = id(obj)
+    if key in memo:
+        stream.append(_encode_ref(memo[key][0]))
+        return
+    data = _encode_cache.get(obj)
+    if data is None:
+        data = obj.encode("utf8")
+        if len(obj) <= ENCODE_CACHE_MAX_LEN and len(_encode_cache) < ENCODE_CACHE_SIZE:
+            _encode_cache[obj] = data
+    # whether the string is memoized goes by its encoded length, as len() of
+    # non-BMP strings differs between narrow Python 2 builds and Python 3
+    lendata = len(data)
+    if lendata > 4:
+        memo[key] = (len(memo), obj)
+    # the encoded string is written as a bytes body, but not memoized on its own
     stream.append(TAG_UNICODE)
-    _dump_bytes(obj.encode("utf8"), stream)
+    if lendata < 256:
+        stream.append(_STR_HEADERS[lendata])
+    else:
+        stream.append(TI4.pack(TAG_STR_L4, lendata))
+    stream.append(data)
 
 
 if not is_py3k:
@@ -163,12 +248,38 @@ if not is_py3k:
         _dump_int(obj, stream)
 
 
+def _all_ints(items):
+    for item in items:
+        if type(item) is not int:
+            return False
+    return True
+
+
+def _pack_small_ints(items):
+    """packs ints in ``[-0x50, 0xb0)`` as a single byte per item, or returns
+    ``None`` if any of the items doesn't fit"""
+    try:
+        return bytes(bytearray([item + 0x50 for item in items]))
+    except ValueError:
+        return None
+
+
+def _pack_int64s(items):
+    """packs ints as 8 bytes per item, or returns ``None`` if any of the items
+    doesn't fit in 64 bits"""
+    try:
+        return struct.pack("!%dq" % (len(items),), *items)
+    except struct.error:
+        return None
+
+
 @register(_dump_registry, tuple)
 def _dump_tuple(obj, stream):
     lenobj = len(obj)
     if lenobj == 0:
         stream.append(TAG_EMPTY_TUPLE)
-    elif lenobj == 1:
+        return
+    if lenobj == 1:
         stream.append(TAG_TUP1)
     elif lenobj == 2:
         stream.append(TAG_TUP2)
@@ -176,29 +287,91 @@ def _dump_tuple(obj, stream):
         stream.append(TAG_TUP3)
     elif lenobj == 4:
         stream.append(TAG_TUP4)
-    elif lenobj < 256:
-        stream.append(TAG_TUP_L1 + I1.pack(lenobj))
     else:
-        stream.append(TAG_TUP_L4 + I4.pack(lenobj))
+        # tuples of ints are packed in one go, without a tag per item: a byte
+        # each if they are small enough, or 8 bytes each if they fit in 64 bits.
+        # shorter tuples are left alone, as this would cost them extra bytes
+        if _all_ints(obj):
+            packed = _pack_small_ints(obj)
+            if packed is not None:
+                if lenobj < 256:
+                    stream.append(_TUP_IMM_L1_HEADERS[lenobj])
+                else:
+                    stream.append(TI4.pack(TAG_TUP_IMM_L4, lenobj))
+                stream.append(packed)
+                return
+            packed = _pack_int64s(obj)
+            if packed is not None:
+                stream.append(TI4.pack(TAG_TUP_INT64, lenobj))
+                stream.append(packed)
+                return
+        if lenobj < 256:
+            stream.append(_TUP_L1_HEADERS[lenobj])
+        else:
+            stream.append(TI4.pack(TAG_TUP_L4, lenobj))
+    # the common scalars are handled inline and everything else is dispatched
+    # directly, which saves a _dump() frame per item
+    registry = _dump_registry
     for item in obj:
-        _dump(item, stream)
+        t = type(item)
+        if t is int and -0x30 <= item < 0xa0:
+            stream.append(IMM_INTS_LIST[item + 0x30])
+        elif item is None:
+            stream.append(TAG_NONE)
+        elif item is True:
+            stream.append(TAG_TRUE)
+        elif item is False:
+            stream.append(TAG_FALSE)
+        else:
+            registry.get(t, _undumpable)(item, stream)
 
 
 def _undumpable(obj, stream):
     raise TypeError("cannot dump %r" % (obj,))
 
 
-def _dump(obj, stream):
-    _dump_registry.get(type(obj), _undumpable)(obj, stream)
+def _dump(obj, stream, _registry=_dump_registry, _type=type, _undumpable=_undumpable):
+    # the globals are bound as defaults, as local lookups are cheaper
+    try:
+        func = _registry[_type(obj)]
+    except KeyError:
+        func = _undumpable
+    func(obj, stream)
 
-def read_str(stream, l):
-    if is_py3k:
-        return stream.read(l).decode('ascii')
-    else:
+if is_py3k:
+    def read_str(stream, l):
+        pos = stream.pos
+        stream.pos = pos + l
+        return stream.buf[pos:pos + l].decode('ascii')
+else:
+    def read_str(stream, l):
         return stream.read(l)
+
+
 # ===============================================================================
 # loading
 # ===============================================================================
+class _Reader(object):
+    """The data being loaded, along with the objects that back-references may
+    point to, in the order they were dumped. The hot loaders index :attr:`buf`
+    at :attr:`pos` directly, rather than calling :func:`read` for every tag"""
+    __slots__ = ("buf", "pos", "memo")
+
+    def __init__(self, data):
+        # indexing a bytearray gives ints on Python 2 as well
+        self.buf = data if is_py3k else bytearray(data)
+        self.pos = 0
+        self.memo = []
+
+    def read(self, count):
+        pos = self.pos
+        self.pos = pos + count
+        if is_py3k:
+            return self.buf[pos:pos + count]
+        else:
+            return bytes(self.buf[pos:pos + count])
+
+
 @register(_load_registry, TAG_NONE)
 def _load_none(stream):
     return None
@@ -248,19 +421,22 @@ else:
 
 @register(_load_registry, TAG_FLOAT)
 def _load_float(stream):
-    return F8.unpack(stream.read(8))[0]
+    pos = stream.pos
+    stream.pos = pos + 8
+    return F8.unpack_from(stream.buf, pos)[0]
 
 
 @register(_load_registry, TAG_COMPLEX)
 def _load_complex(stream):
-    real, imag = C16.unpack(stream.read(16))
+    pos = stream.pos
+    stream.pos = pos + 16
+    real, imag = C16.unpack_from(stream.buf, pos)
     return complex(real, imag)
 
 
 @register(_load_registry, TAG_STR1)
 def _load_str1(stream):
     return read_str(stream, 1)
-    
 
 
 @register(_load_registry, TAG_STR2)
@@ -280,20 +456,77 @@ def _load_str4(stream):
 
 @register(_load_registry, TAG_STR_L1)
 def _load_str_l1(stream):
-    l, = I1.unpack(stream.read(1))
-    return read_str(stream, l)
+    pos = stream.pos
+    stream.pos = pos + 1
+    obj = read_str(stream, stream.buf[pos])
+    stream.memo.append(obj)
+    return obj
 
 
 @register(_load_registry, TAG_STR_L4)
 def _load_str_l4(stream):
-    l, = I4.unpack(stream.read(4))
-    return read_str(stream, l)
+    pos = stream.pos
+    stream.pos = pos + 4
+    l, = I4.unpack_from(stream.buf, pos)
+    obj = read_str(stream, l)
+    stream.memo.append(obj)
+    return obj
 
 
 @register(_load_registry, TAG_UNICODE)
 def _load_unicode(stream):
-    obj = _load(stream)
-    return obj.decode("utf-8")
+    buf = stream.buf
+    pos = stream.pos
+    tag = buf[pos]
+    if tag in _STR_LENGTHS:
+        l = _STR_LENGTHS[tag]
+        pos += 1
+    elif tag == _STR_L1_ORD:
+        l = buf[pos + 1]
+        pos += 2
+    else:
+        l, = I4.unpack_from(buf, pos + 1)
+        pos += 5
+    stream.pos = pos + l
+    obj = buf[pos:pos + l].decode("utf-8")
+    if l > 4:
+        stream.memo.append(obj)
+    return obj
+
+
+@register(_load_registry, TAG_REF)
+def _load_ref(stream):
+    buf = stream.buf
+    pos = stream.pos
+    index = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        index |= (b & 0x7f) << shift
+        if b < 0x80:
+            stream.pos = pos
+            return stream.memo[index]
+        shift += 7
+
+
+def _load_items(stream, count, _table=LOAD_TABLE):
+    """loads *count* consecutive objects into a tuple. Immediate ints are
+    decoded inline and the rest are dispatched directly, which saves a _load()
+    frame per item"""
+    buf = stream.buf
+    # the count comes off the wire, and every item takes at least a byte
+    if count > len(buf) - stream.pos:
+        raise ValueError("tuple of %d items is longer than the data left" % (count,))
+    items = [None] * count
+    for i in range(count):
+        pos = stream.pos
+        tag = buf[pos]
+        stream.pos = pos + 1
+        if 0x20 <= tag < 0xf0:
+            items[i] = tag - 0x50
+        else:
+            items[i] = _table[tag](stream)
+    return tuple(items)
 
 
 @register(_load_registry, TAG_TUP1)
@@ -318,20 +551,48 @@ def _load_tup4(stream):
 
 @register(_load_registry, TAG_TUP_L1)
 def _load_tup_l1(stream):
-    l, = I1.unpack(stream.read(1))
-    return tuple(_load(stream) for i in range(l))
-
-
-if is_py3k:
-    @register(_load_registry, TAG_TUP_L4)
-    def _load_tup_l4(stream):
-        l, = I4.unpack(stream.read(4))
-        return tuple(_load(stream) for i in range(l))
-else:
-    @register(_load_registry, TAG_TUP_L4)
-    def _load_tup_l4(stream):
-        l, = I4.unpack(stream.read(4))
-        return tuple(_load(stream) for i in xrange(l))  # noqa
+    pos = stream.pos
+    stream.pos = pos + 1
+    return _load_items(stream, stream.buf[pos])
+
+
+@register(_load_registry, TAG_TUP_L4)
+def _load_tup_l4(stream):
+    pos = stream.pos
+    stream.pos = pos + 4
+    l, = I4.unpack_from(stream.buf, pos)
+    return _load_items(stream, l)
+
+
+@register(_load_registry, TAG_TUP_IMM_L1)
+def _load_tup_imm_l1(stream):
+    buf = stream.buf
+    pos = stream.pos + 1
+    end = pos + buf[pos - 1]
+    if end > len(buf):
+        raise ValueError("tuple of %d items is longer than the data left" % (end - pos,))
+    stream.pos = end
+    return tuple([b - 0x50 for b in buf[pos:end]])
+
+
+@register(_load_registry, TAG_TUP_IMM_L4)
+def _load_tup_imm_l4(stream):
+    buf = stream.buf
+    pos = stream.pos + 4
+    end = pos + I4.unpack_from(buf, pos - 4)[0]
+    if end > len(buf):
+        raise ValueError("tuple of %d items is longer than the data left" % (end - pos,))
+    stream.pos = end
+    return tuple([b - 0x50 for b in buf[pos:end]])
+
+
+@register(_load_registry, TAG_TUP_INT64)
+def _load_tup_int64(stream):
+    buf = stream.buf
+    pos = stream.pos
+    l, = I4.unpack_from(buf, pos)
+    stream.pos = pos + 4 + 8 * l
+    return struct.unpack_from("!%dq" % (l,), buf, pos + 4)
 
 
 @register(_load_registry, TAG_SLICE)
@@ -347,21 +608,42 @@ def _load_frozenset(stream):
 
 @register(_load_registry, TAG_INT_L1)
 def _load_int_l1(stream):
-    l, = I1.unpack(stream.read(1))
-    return int(stream.read(l))
+    pos = stream.pos
+    stream.pos = pos + 1
+    return int(stream.read(stream.buf[pos]))
 
 
 @register(_load_registry, TAG_INT_L4)
 def _load_int_l4(stream):
-    l, = I4.unpack(stream.read(4))
+    pos = stream.pos
+    stream.pos = pos + 4
+    l, = I4.unpack_from(stream.buf, pos)
     return int(stream.read(l))
 
 
-def _load(stream):
-    tag = stream.read(1)
-    if tag in IMM_INTS_LOADER:
-        return IMM_INTS_LOADER[tag]
-    return _load_registry.get(tag)(stream)
+@register(_load_registry, TAG_INT64)
+def _load_int64(stream):
+    pos = stream.pos
+    stream.pos = pos + 8
+    return I8.unpack_from(stream.buf, pos)[0]
+
+
+def _imm_int_loader(value):
+    def _load_imm_int(stream):
+        return value
+    return _load_imm_int
+
+
+for _value, _tag in IMM_INTS.items():
+    LOAD_TABLE[ord(_tag)] = _imm_int_loader(_value)
+for _tag, _func in _load_registry.items():
+    LOAD_TABLE[ord(_tag)] = _func
+
+
+def _load(stream, _table=LOAD_TABLE):
+    pos = stream.pos
+    stream.pos = pos + 1
+    return _table[stream.buf[pos]](stream)
 
 # ===============================================================================
 # API
@@ -375,7 +657,7 @@ def dump(obj):
 
     :returns: a byte-string representation of the object
     """
-    stream = []
+    stream = _Writer()
     _dump(obj, stream)
     return b"".join(stream)
 
@@ -387,7 +669,7 @@ def load(data):
 
     :returns: the dumped object
     """
-    stream = BytesIO(data)
+    stream = _Reader(data)
     return _load(stream)
 
 
@@ -407,11 +689,137 @@ def dumpable(obj):
     """
     if type(obj) in simple_types:
         return True
-    if type(obj) in (tuple, frozenset):
-        return all(dumpable(item) for item in obj)
-    if type(obj) is slice:
-        return dumpable(obj.start) and dumpable(obj.stop) and dumpable(obj.step)
-    return False
+    return _dumpable(obj, set())
+
+
+def _dumpable(obj, seen):
+    # *seen* holds the ids of the composites already checked during this call,
+    # so shared sub-objects are only walked once
+    t = type(obj)
+    if t in simple_types:
+        return True
+    if t is tuple or t is frozenset:
+        items = obj
+    elif t is slice:
+        items = (obj.start, obj.stop, obj.step)
+    else:
+        return False
+    key = id(obj)
+    if key in seen:
+        return True
+    seen.add(key)
+    for item in items:
+        if not _dumpable(item, seen):
+            return False
+    return True
+
+
+# floats and complexes are left out since equal values may still dump differently
+# (``0.0 == -0.0``, and ``nan`` never equals itself)
+_cacheable_types = simple_types - frozenset([float, complex])
+_dump_cache = {}
+DUMP_CACHE_SIZE = 4096
+# only small frames are cached: the objects are kept as keys along with their dumps
+DUMP_CACHE_MAX_LEN = 256
+_sized_types = (bytes, type(u""))
+
+
+def _type_signature(obj, budget):
+    # the type of *obj* (recursively for tuples) and what's left of *budget*, which
+    # counts down the items and string lengths. the signature is None if *obj*
+    # can't be cached or is too large. keying the cache on (obj, signature) keeps
+    # ``1``, ``1L`` and ``True`` apart
+    t = type(obj)
+    if t is tuple:
+        budget -= len(obj)
+        if budget < 0:
+            return None, budget
+        signature = []
+        for item in obj:
+            s, budget = _type_signature(item, budget)
+            if s is None:
+                return None, budget
+            signature.append(s)
+        return tuple(signature), budget
+    if t in _sized_types:
+        budget -= len(obj)
+        if budget < 0:
+            return None, budget
+    if t in _cacheable_types:
+        return t, budget
+    return None, budget
+
+
+def dump_cached(obj):
+    """Same as :func:`dump`, but remembers the result for small objects made of
+    hashable simple types (nested tuples of ints, strings, ``None``, etc.), so
+    that frames sent over and over again are only serialized once
+
+    :param obj: any :func:`dumpable` object
+
+    :returns: a byte-string representation of the object
+    """
+    signature, _ = _type_signature(obj, DUMP_CACHE_MAX_LEN)
+    if signature is None:
+        return dump(obj)
+    key = (obj, signature)
+    try:
+        return _dump_cache[key]
+    except KeyError:
+        pass
+    data = dump(obj)
+    if len(data) > DUMP_CACHE_MAX_LEN:
+        return data  # e.g. huge ints, which the signature doesn't measure
+    if len(_dump_cache) >= DUMP_CACHE_SIZE:
+        _dump_cache.clear()
+    _dump_cache[key] = data
+    return data
+
+
+def specialize(schema):
+    """Generates a dumper for tuples of a fixed shape, such as the protocol's
+    ``(msg, seq, args)`` frames. The returned function takes the items of the
+    tuple as its arguments and returns the same byte-string :func:`dump` would
+    for the tuple, but the items of the expected types skip the generic dispatch
+
+    :param schema: a tuple of 1 to 4 types, the expected types of the items;
+                   ``object`` stands for any type. Items that turn out to be of
+                   another type are still dumped correctly, only not as fast
+
+    :returns: a function taking ``len(schema)`` arguments
+    """
+    if not 1 <= len(schema) <= 4:
+        raise ValueError("can only specialize tuples of 1 to 4 items, not %r" % (schema,))
+    namespace = dict(_Writer=_Writer, _dump=_dump, IMM_INTS_LIST=IMM_INTS_LIST, TI8=TI8,
+                     TAG_INT64=TAG_INT64, header=(TAG_TUP1, TAG_TUP2, TAG_TUP3, TAG_TUP4)[len(schema) - 1])
+    names = ["a%d" % (i,) for i in range(len(schema))]
+    lines = ["def dump_specialized(%s):" % (", ".join(names),),
+             "    stream = _Writer()",
+             "    stream.append(header)"]
+    for i, (name, t) in enumerate(zip(names, schema)):
+        if t is object:
+            lines.append("    _dump(%s, stream)" % (name,))
+        elif t is int:
+            lines.extend([
+                "    if type(%s) is int and -0x30 <= %s < 0xa0:" % (name, name),
+                "        stream.append(IMM_INTS_LIST[%s + 0x30])" % (name,),
+                "    elif type(%s) is int and -0x8000000000000000 <= %s < 0x8000000000000000:" % (name, name),
+                "        stream.append(TI8.pack(TAG_INT64, %s))" % (name,),
+                "    else:",
+                "        _dump(%s, stream)" % (name,)])
+        elif t in _dump_registry:
+            namespace["t%d" % (i,)] = t
+            namespace["dump%d" % (i,)] = _dump_registry[t]
+            lines.extend([
+                "    if type(%s) is t%d:" % (name, i),
+                "        dump%d(%s, stream)" % (i, name),
+                "    else:",
+                "        _dump(%s, stream)" % (name,)])
+        else:
+            raise TypeError("cannot dump %r" % (t,))
+    lines.append('    return b"".join(stream)')
+    execute("\n".join(lines), namespace)
+    return namespace["dump_specialized"]
 
 
 if __name__ == "__main__":
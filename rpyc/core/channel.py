@@ -70,6 +70,11 @@ class Channel(object):
             data = zlib.compress(data, self.COMPRESSION_LEVEL)
         else:
             compressed = 0
-        self.stream.write(self.FRAME_HEADER.pack(len(data), compressed))
-        self.stream.write(data)
-        self.stream.write(self.FLUSHER)
+        header = self.FRAME_HEADER.pack(len(data), compressed)
+        writev = getattr(self.stream, "writev", None)
+        if writev is None:  # stream objects that don't derive from Stream
+            self.stream.write(header)
+            self.stream.write(data)
+            self.stream.write(self.FLUSHER)
+        else:
+            writev((header, data, self.FLUSHER))
@@ -14,6 +14,10 @@ from rpyc.core import consts, brine, vinegar, netref
 from rpyc.core.async_ import AsyncResult
 
 
+# the (msg, seq, args) frames all have the same shape
+_dump_frame = brine.specialize((int, int, tuple))
+
+
 class PingError(Exception):
     """The exception raised should :func:`Connection.ping` fail"""
     pass
@@ -230,7 +234,7 @@ class Connection(object):
         return next(self._seqcounter)
 
     def _send(self, msg, seq, args):  # IO
-        data = brine.dump((msg, seq, args))
+        data = _dump_frame(msg, seq, args)
         # GC might run while sending data
         # if so, a BaseNetref.__del__ might be called
         # BaseNetref.__del__ must call asyncreq,
@@ -37,13 +37,20 @@ class Stream(object):
     def poll(self, timeout):
         """indicates whether the stream has data to read (within *timeout*
         seconds)"""
-        timeout = Timeout(timeout)
+        # polling forever doesn't need a Timeout object, and the one passed by
+        # Connection.serve is only read from, so it needn't be copied
+        if isinstance(timeout, Timeout):
+            if not timeout.finite:
+                timeout = None
+        elif timeout is None or timeout < 0:
+            timeout = None
+        else:
+            timeout = Timeout(timeout)
         try:
-            p = poll()   # from lib.compat, it may be a select object on non-Unix platforms
-            p.register(self.fileno(), "r")
+            p = self._get_poller()
             while True:
                 try:
-                    rl = p.poll(timeout.timeleft())
+                    rl = p.poll(None if timeout is None else timeout.timeleft())
                 except select_error:
                     ex = sys.exc_info()[1]
                     if ex.args[0] == errno.EINTR:
@@ -61,6 +68,12 @@ class Stream(object):
             raise select_error(str(ex))
         return bool(rl)
 
+    def _get_poller(self):
+        """returns a poller with the stream's file descriptor registered for reading"""
+        p = poll()   # from lib.compat, it may be a select object on non-Unix platforms
+        p.register(self.fileno(), "r")
+        return p
+
     def read(self, count):
         """reads **exactly** *count* bytes, or raise EOFError
 
@@ -77,6 +90,14 @@ class Stream(object):
         """
         raise NotImplementedError()
 
+    def writev(self, buffers):
+        """writes all the given *buffers*, one after the other, or raise EOFError
+
+        :param buffers: a sequence of strings of binary data
+        """
+        for data in buffers:
+            self.write(data)
+
     def __enter__(self):
         return self
 
@@ -110,11 +131,12 @@ ClosedFile = ClosedFile()
 class SocketStream(Stream):
     """A stream over a socket"""
 
-    __slots__ = ("sock",)
+    __slots__ = ("sock", "_poller")
     MAX_IO_CHUNK = 64000  # read/write chunk is 64KB, too large of a value will degrade response for other clients
 
     def __init__(self, sock):
         self.sock = sock
+        self._poller = None
 
     @classmethod
     def _connect(cls, host, port, family=socket.AF_INET, socktype=socket.SOCK_STREAM,
@@ -228,6 +250,17 @@ class SocketStream(Stream):
                 pass
         self.sock.close()
         self.sock = ClosedFile
+        self._poller = None
+
+    def _get_poller(self):
+        # the poller is kept for as long as the socket is open, sparing the
+        # creation of a poll object and the registration of the fd on every
+        # poll. polls are serialized by the connection's receive lock. subclasses
+        # that don't call SocketStream.__init__ won't have the slot set
+        p = getattr(self, "_poller", None)
+        if p is None:
+            p = self._poller = Stream._get_poller(self)
+        return p
 
     def fileno(self):
         try:
@@ -262,10 +295,39 @@ class SocketStream(Stream):
         return BYTES_LITERAL("").join(data)
 
     def write(self, data):
+        # slicing a memoryview doesn't copy, whereas re-slicing the remaining
+        # data after every send() made large writes quadratic
+        view = memoryview(data)
+        total = len(view)
+        pos = 0
         try:
-            while data:
-                count = self.sock.send(data[:self.MAX_IO_CHUNK])
-                data = data[count:]
+            while pos < total:
+                pos += self.sock.send(view[pos:pos + self.MAX_IO_CHUNK])
+        except socket.error:
+            ex = sys.exc_info()[1]
+            self.close()
+            raise EOFError(ex)
+
+    def writev(self, buffers):
+        # the buffers are handed to a single sendmsg(), so that a frame's header
+        # and body leave in the same segment whether or not TCP_NODELAY is set.
+        # large writes are still sent one chunk at a time
+        sendmsg = getattr(self.sock, "sendmsg", None)
+        views = [memoryview(data) for data in buffers if len(data)]
+        if sendmsg is None or sum(len(view) for view in views) > self.MAX_IO_CHUNK:
+            return Stream.writev(self, views)
+        try:
+            while views:
+                try:
+                    sent = sendmsg(views)
+                except NotImplementedError:  # ssl sockets
+                    return Stream.writev(self, views)
+                # drop whatever was sent, as sendmsg() may stop anywhere
+                while sent:
+                    if sent < len(views[0]):
+                        views[0] = views[0][sent:]
+                        break
+                    sent -= len(views.pop(0))
         except socket.error:
             ex = sys.exc_info()[1]
             self.close()
@@ -278,7 +340,7 @@ class TunneledSocketStream(SocketStream):
     __slots__ = ("tun",)
 
     def __init__(self, sock):
-        self.sock = sock
+        SocketStream.__init__(self, sock)
         self.tun = None
 
     def close(self):
@@ -322,7 +322,7 @@ class UDPRegistryClient(RegistryClient):
         with closing(sock):
             if self.bcast:
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
-            data = brine.dump(("RPYC", "QUERY", (name,)))
+            data = brine.dump_cached(("RPYC", "QUERY", (name,)))
             sock.sendto(data, (self.ip, self.port))
             sock.settimeout(self.timeout)
 
@@ -341,7 +341,7 @@ class UDPRegistryClient(RegistryClient):
             sock.bind((interface, 0))
             if self.bcast:
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
-            data = brine.dump(("RPYC", "REGISTER", (aliases, port)))
+            data = brine.dump_cached(("RPYC", "REGISTER", (aliases, port)))
             sock.sendto(data, (self.ip, self.port))
 
             tmax = time.time() + self.timeout
@@ -372,7 +372,7 @@ class UDPRegistryClient(RegistryClient):
         with closing(sock):
             if self.bcast:
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
-            data = brine.dump(("RPYC", "UNREGISTER", (port,)))
+            data = brine.dump_cached(("RPYC", "UNREGISTER", (port,)))
             sock.sendto(data, (self.ip, self.port))
 
 
@@ -400,7 +400,7 @@ class TCPRegistryClient(RegistryClient):
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         with closing(sock):
             sock.settimeout(self.timeout)
-            data = brine.dump(("RPYC", "QUERY", (name,)))
+            data = brine.dump_cached(("RPYC", "QUERY", (name,)))
             sock.connect((self.ip, self.port))
             sock.send(data)
 
@@ -418,7 +418,7 @@ class TCPRegistryClient(RegistryClient):
         with closing(sock):
             sock.bind((interface, 0))
             sock.settimeout(self.timeout)
-            data = brine.dump(("RPYC", "REGISTER", (aliases, port)))
+            data = brine.dump_cached(("RPYC", "REGISTER", (aliases, port)))
             try:
                 sock.connect((self.ip, self.port))
                 sock.send(data)
@@ -445,7 +445,7 @@ class TCPRegistryClient(RegistryClient):
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         with closing(sock):
             sock.settimeout(self.timeout)
-            data = brine.dump(("RPYC", "UNREGISTER", (port,)))
+            data = brine.dump_cached(("RPYC", "UNREGISTER", (port,)))
             try:
                 sock.connect((self.ip, self.port))
                 sock.send(data)
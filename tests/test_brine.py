@@ -16,6 +16,103 @@ class BrineTest(unittest.TestCase):
         z = brine.load(y)
         self.assertEqual(x, z)  # noqa
 
+    def test_int64(self):
+        for x in (0xa0, -0x31, 900, 2 ** 63 - 1, -2 ** 63, 2 ** 63, -2 ** 63 - 1, 10 ** 40):
+            y = brine.dump(x)
+            self.assertEqual(y[:1] == brine.TAG_INT64, -2 ** 63 <= x < 2 ** 63)
+            self.assertEqual(brine.load(y), x)
+
+    def test_small_int_tuple(self):
+        x = tuple(range(-0x50, 0xb0, 3)) + (0xaf,)
+        y = brine.dump(x)
+        self.assertEqual(y[:1], brine.TAG_TUP_IMM_L1)
+        self.assertEqual(len(y), len(x) + 2)
+        self.assertEqual(brine.load(y), x)
+        x = (0,) * 300
+        y = brine.dump(x)
+        self.assertEqual(y[:1], brine.TAG_TUP_IMM_L4)
+        self.assertEqual(len(y), len(x) + 5)
+        self.assertEqual(brine.load(y), x)
+        for x in ((1, 2, 3, 4, 5, True), (1, 2, 3, 4, 5, 0xb0), (1, 2, 3, 4, -0x51, 5)):
+            y = brine.dump(x)
+            self.assertNotEqual(y[:1], brine.TAG_TUP_IMM_L1)
+            self.assertEqual(brine.load(y), x)
+
+    def test_int64_tuple(self):
+        x = tuple(range(10 ** 6, 10 ** 6 + 300)) + (2 ** 63 - 1, -2 ** 63)
+        y = brine.dump(x)
+        self.assertEqual(y[:1], brine.TAG_TUP_INT64)
+        self.assertEqual(len(y), 8 * len(x) + 5)
+        self.assertEqual(brine.load(y), x)
+        for x in ((1, 2, 3, 4, 0xb0, 2 ** 63), (1000, 2, 3, 4, 5, None)):
+            y = brine.dump(x)
+            self.assertEqual(y[:1], brine.TAG_TUP_L1)
+            self.assertEqual(brine.load(y), x)
+
+    def test_back_references(self):
+        names = tuple(u"name%d" % i for i in range(200))
+        x = (names, names[::-1], slice(names[0], None, None))
+        y = brine.dump(x)
+        self.assertLess(len(y), len(brine.dump(names)) + 3 * len(names))
+        z = brine.load(y)
+        self.assertEqual(z[:2], x[:2])
+        self.assertIs(z[0][0], z[1][-1])
+        self.assertIs(z[0][150], z[1][-151])
+        self.assertIs(z[2].start, z[0][0])
+
+    def test_no_container_references(self):
+        # each level is (child, <ref to child>): if tuples could be referenced,
+        # this would expand to 2 ** 40 items
+        data = brine.dump(u"hello")
+        for i in range(40):
+            data = brine.TAG_TUP2 + data + brine.TAG_REF + brine.I1.pack(i)
+        self.assertRaises(IndexError, brine.load, data)
+
+    def test_truncated_tuple(self):
+        self.assertRaises(ValueError, brine.load, brine.TAG_TUP_L4 + b"\xff\xff\xff\xff")
+        self.assertRaises(ValueError, brine.load, brine.TAG_TUP_L1 + b"\x06\x00")
+        self.assertRaises(ValueError, brine.load, brine.TAG_TUP_IMM_L1 + b"\xff")
+        self.assertRaises(ValueError, brine.load, brine.TAG_TUP_IMM_L1 + b"\x06\x50")
+        self.assertRaises(ValueError, brine.load, brine.TAG_TUP_IMM_L4 + b"\xff\xff\xff\xff")
+
+    def test_unicode(self):
+        names = (u"", u"a", u"abcd", u"__getattribute__", u"h\xe9llo", u"\u2603" * 300,
+                 u"\u2603\u2603", u"\U0001F600" * 3)
+        x = names + names + tuple(name[:] + u"" for name in names)
+        y = brine.dump(x)
+        self.assertEqual(brine.load(y), x)
+        self.assertLess(len(y), 2 * len(brine.dump(names)))
+        # strings under 5 characters but over 4 bytes are referenced too
+        z = brine.load(y)
+        for i in (len(names) - 2, len(names) - 1):
+            self.assertIs(z[len(names) + i], z[i])
+
+    def test_shared_structure(self):
+        x = (1,)
+        for i in range(100):
+            x = (x, x)
+        self.assertTrue(brine.dumpable(x))
+        self.assertFalse(brine.dumpable((x, [x])))
+
+    def test_dump_cached(self):
+        for x in (("RPYC", "REGISTER", (("FOO", "BAR"), 18812)), (1, (1,)), (True, (True,)), 1.5):
+            y = brine.dump_cached(x)
+            self.assertEqual(y, brine.dump(x))
+            self.assertEqual(brine.dump_cached(x), y)
+        self.assertNotEqual(brine.dump_cached((1, 2)), brine.dump_cached((True, 2)))
+        for x in (u"x" * 1000, tuple(range(1000)), ((u"x" * 100,) * 10,), 10 ** 1000):
+            brine._dump_cache.clear()
+            self.assertEqual(brine.dump_cached(x), brine.dump(x))
+            self.assertEqual(brine._dump_cache, {})
+
+    def test_specialize(self):
+        dump_frame = brine.specialize((int, int, tuple))
+        name = u"__getattribute__"
+        for x in ((1, 2, (name, name)), (1, 2 ** 40, ()), (-0x31, 2 ** 70, None), (True, u"seq", (1.5,))):
+            self.assertEqual(dump_frame(*x), brine.dump(x))
+        self.assertRaises(ValueError, brine.specialize, (int,) * 5)
+        self.assertRaises(TypeError, brine.specialize, (int, list))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+import socket
+import unittest
+from rpyc.core.stream import SocketStream
+from rpyc.core.channel import Channel
+
+
+class LegacySocketStream(SocketStream):
+    """a subclass that sets up its socket without calling SocketStream.__init__"""
+    __slots__ = ()
+
+    def __init__(self, sock):
+        self.sock = sock
+
+
+class FakeSocket(object):
+    """records what is sent; sendmsg() takes at most *limit* bytes per call"""
+
+    def __init__(self, limit=3, has_sendmsg=True):
+        self.limit = limit
+        self.sent = []
+        self.sendmsg_calls = 0
+        if not has_sendmsg:
+            self.sendmsg = self._no_sendmsg
+
+    def sendmsg(self, buffers):
+        self.sendmsg_calls += 1
+        data = b"".join(bytes(buf) for buf in buffers)[:self.limit]
+        self.sent.append(data)
+        return len(data)
+
+    def _no_sendmsg(self, buffers):
+        raise NotImplementedError("like ssl sockets")
+
+    def send(self, data):
+        self.sent.append(bytes(data))
+        return len(data)
+
+
+class WriteOnlyStream(object):
+    """a stream object that doesn't derive from Stream"""
+
+    def __init__(self):
+        self.sent = []
+
+    def write(self, data):
+        self.sent.append(data)
+
+
+class Test_SocketStream(unittest.TestCase):
+
+    def setUp(self):
+        a, b = socket.socketpair()
+        self.left = SocketStream(a)
+        self.right = SocketStream(b)
+
+    def tearDown(self):
+        self.left.close()
+        self.right.close()
+
+    def test_poll(self):
+        self.assertFalse(self.right.poll(0))
+        self.left.write(b"x")
+        self.assertTrue(self.right.poll(0))
+        self.assertTrue(self.right.poll(None))
+        self.assertEqual(self.right.read(1), b"x")
+        self.right.close()
+        self.assertRaises(EOFError, self.right.poll, 0)
+
+    def test_poll_legacy_subclass(self):
+        stream = LegacySocketStream(self.right.sock)
+        self.assertFalse(stream.poll(0))
+        self.left.write(b"x")
+        self.assertTrue(stream.poll(0))
+
+    def test_writev(self):
+        self.left.writev([b"ab", b"", bytearray(b"cd"), memoryview(b"ef")])
+        self.assertEqual(self.right.read(6), b"abcdef")
+
+    def test_writev_partial_sends(self):
+        stream = SocketStream(FakeSocket(limit=3))
+        stream.writev([b"hello", b"", b"wor", b"ld!"])
+        self.assertEqual(b"".join(stream.sock.sent), b"helloworld!")
+        self.assertEqual(stream.sock.sendmsg_calls, 4)
+
+    def test_writev_without_sendmsg(self):
+        stream = SocketStream(FakeSocket(has_sendmsg=False))
+        stream.writev([b"hello", b"world"])
+        self.assertEqual(stream.sock.sent, [b"hello", b"world"])
+
+    def test_writev_large(self):
+        stream = SocketStream(FakeSocket())
+        data = b"x" * (SocketStream.MAX_IO_CHUNK + 1)
+        stream.writev([b"head", data])
+        self.assertEqual(stream.sock.sendmsg_calls, 0)
+        self.assertEqual(b"".join(stream.sock.sent), b"head" + data)
+
+
+class Test_Channel(unittest.TestCase):
+
+    def test_send_recv(self):
+        a, b = socket.socketpair()
+        left, right = Channel(SocketStream(a)), Channel(SocketStream(b))
+        try:
+            for data in (b"", b"hello", b"x" * 5000):
+                left.send(data)
+                self.assertEqual(right.recv(), data)
+        finally:
+            left.close()
+            right.close()
+
+    def test_send_without_writev(self):
+        stream = WriteOnlyStream()
+        Channel(stream, compress=False).send(b"hello")
+        self.assertEqual(b"".join(stream.sent), Channel.FRAME_HEADER.pack(5, 0) + b"hello\n")
+
+
+if __name__ == "__main__":
+    unittest.main()